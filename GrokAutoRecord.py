@@ -11,13 +11,18 @@ import threading
 
 import numpy as np
 
-file_path = r"C:\Users\polid\Documents\tradingscripts\Data Logs\Historic Ticker Details\AutoLog1.txt"
-
-# Ensure the file exists or create it
-if not os.path.exists(file_path):
-    with open(file_path, 'w') as file:
-        file.write("Timestamp,Ticker,Open,High,Low,Close,Adj Close,Volume,Current Price,Price at Open,Previous Close,"
-                   "50-Day MA,200-Day MA,RSI,Bollinger Upper,Bollinger Lower,ATR\n")
+from app_config import load_config
+from record_scheduler import PollScheduler
+
+def ensure_log_file(file_path):
+    """Create the log file (and its folder) with a header row if it doesn't exist yet."""
+    if not os.path.exists(file_path):
+        folder = os.path.dirname(file_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(file_path, 'w') as file:
+            file.write("Timestamp,Ticker,Open,High,Low,Close,Adj Close,Volume,Current Price,Price at Open,Previous Close,"
+                       "50-Day MA,200-Day MA,RSI,Bollinger Upper,Bollinger Lower,ATR\n")
 
 def safe_get(data, column, idx=-1):
     if column in data.columns and len(data) > abs(idx):
@@ -163,55 +168,76 @@ def calculate_indicators(data,ticker):
         'ATR':atr,
         }
 
-def fetch_and_log_data(ticker, interval, run_duration):
+def fetch_and_log_data(ticker, interval, run_duration, scheduler=None, file_path=None, error_path='error_log.txt'):
+    if scheduler is None:
+        scheduler = PollScheduler(interval)
+    if file_path is None:
+        file_path = load_config()['paths']['record_log']
+        ensure_log_file(file_path)
     start_time = time.time()
-    while time.time() - start_time < run_duration:
+    deadline = start_time + run_duration
+    while time.time() < deadline:
         try:
+            if not scheduler.wait_for_slot(deadline):
+                break
             data = yf.download(ticker, period='2y', interval='1d')
             print(f"DEBUG: Fetched {len(data)} rows of data for {ticker}.")
+            scheduler.observe(ticker, data)
             
             if data.empty:
+                # No sleep here, the shared next_delay() below backs the ticker off
                 print(f"No data found for {ticker}. Skipping.")
-                continue
-            
-            
-            today=datetime.datetime.now().date()
-            yesterday=today-datetime.timedelta(days=1)
-            # Ensure `data` index is converted to `datetime.date` for comparison
-            data.index = data.index.date
+            else:
+                today=datetime.datetime.now().date()
+                yesterday=today-datetime.timedelta(days=1)
+                # Ensure `data` index is converted to `datetime.date` for comparison
+                data.index = data.index.date
 
-            # Access today's and yesterday's volume
-            today_volume = data.loc[today, 'Volume'].item() if today in data.index else 'NA'
+                # Access today's and yesterday's volume
+                today_volume = data.loc[today, 'Volume'].item() if today in data.index else 'NA'
 
-            yesterday_volume = data.loc[yesterday, 'Volume'].item() if yesterday in data.index else 'NA'
+                yesterday_volume = data.loc[yesterday, 'Volume'].item() if yesterday in data.index else 'NA'
             
-            indicators = calculate_indicators(data.dropna(),ticker)
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            with open(file_path, 'a') as file:
-                file.write(f"{ticker},{timestamp},{today_volume},{yesterday_volume},"
-                           f"{indicators['Current Price']},{indicators['Price at Open']},{indicators['Previous Close']},{indicators['50-Day MA']},{indicators['200-Day MA']},{indicators['RSI']}," 
-                           f"{indicators['Bollinger Upper']},{indicators['Bollinger Lower']},{indicators['ATR']}\n")# removed {safe_get(data, 'High')},{safe_get(data, 'Low')},{safe_get(data, 'Close')},{safe_get(data, 'Adj Close')},{safe_get(data, 'Volume')},"
-            print(f"Data logged for {ticker}.")
+                indicators = calculate_indicators(data.dropna(),ticker)
+                timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                with open(file_path, 'a') as file:
+                    file.write(f"{ticker},{timestamp},{today_volume},{yesterday_volume},"
+                               f"{indicators['Current Price']},{indicators['Price at Open']},{indicators['Previous Close']},{indicators['50-Day MA']},{indicators['200-Day MA']},{indicators['RSI']}," 
+                               f"{indicators['Bollinger Upper']},{indicators['Bollinger Lower']},{indicators['ATR']}\n")# removed {safe_get(data, 'High')},{safe_get(data, 'Low')},{safe_get(data, 'Close')},{safe_get(data, 'Adj Close')},{safe_get(data, 'Volume')},"
+                print(f"Data logged for {ticker}.")
         except Exception as e:
             print(f"Error fetching data for {ticker}: {e}")
-            with open('error_log.txt', 'a') as error_file:
+            with open(error_path, 'a') as error_file:
                 error_file.write(f"{datetime.datetime.now()} - Error for {ticker}: {e}\n")
-        time.sleep(interval)
-
-def collect_data_for_assets():
-    num_assets = int(input("How many assets would you like to record? "))
-    interval = int(input("Enter the time interval in seconds (e.g., 30): "))
-    run_duration = int(input("Enter total runtime in seconds (e.g., 300 for 5 minutes): "))
+        delay = scheduler.next_delay(ticker)
+        print(f"DEBUG: Next fetch for {ticker} in {delay:.0f}s.")
+        time.sleep(min(delay, max(deadline - time.time(), 0)))
+
+def record_assets(tickers, interval, run_duration, requests_per_minute=60, config=None):
+    """Record every ticker in its own thread until run_duration runs out."""
+    config = config or load_config()
+    file_path = config['paths']['record_log']
+    ensure_log_file(file_path)
+    # One scheduler shared by all threads so they draw from the same request budget
+    scheduler = PollScheduler(interval, requests_per_minute=requests_per_minute)
     threads = []
 
-    for _ in range(num_assets):
-        ticker = input("Enter the ticker symbol (e.g., AAPL, BTC-USD): ").strip().upper()
-        thread = threading.Thread(target=fetch_and_log_data, args=(ticker, interval, run_duration))
+    for ticker in tickers:
+        thread = threading.Thread(target=fetch_and_log_data,
+                                  args=(ticker, interval, run_duration, scheduler, file_path, config['paths']['error_log']))
         threads.append(thread)
         thread.start()
 
     for thread in threads:
         thread.join()
 
+def collect_data_for_assets():
+    num_assets = int(input("How many assets would you like to record? "))
+    interval = int(input("Enter the time interval in seconds (e.g., 30): "))
+    run_duration = int(input("Enter total runtime in seconds (e.g., 300 for 5 minutes): "))
+    budget = int(input("Enter the max downloads per minute across all assets (e.g., 60): ") or 60)
+    tickers = [input("Enter the ticker symbol (e.g., AAPL, BTC-USD): ").strip().upper() for _ in range(num_assets)]
+    record_assets(tickers, interval, run_duration, budget)
+
 if __name__ == "__main__":
     collect_data_for_assets()
@@ -3,21 +3,14 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import warnings
-from datetime import datetime, timedelta
+from datetime import datetime
 
-warnings.filterwarnings("ignore")
+from app_config import load_config
+from ftd_data import load_ftd_cache, parse_ftds_file
+from resample_engine import MultiTimeframeBars
+from run_journal import RunJournal, run_key
 
-# Fetch stock data
-def fetch_stock_data(tickers, start_date, end_date):
-    stock_data = {}
-    for ticker in tickers:
-        try:
-            df = yf.download(ticker, start=start_date, end=end_date)
-            if not df.empty:
-                stock_data[ticker] = df
-        except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
-    return stock_data
+warnings.filterwarnings("ignore")
 
 # Get trend based on returns and volume
 def get_trend(df):
@@ -65,52 +58,6 @@ def get_trend(df):
 
 
 
-# Parse FTD data from file
-def parse_ftds_file(ftd_file_path, tickers):
-    ftd_data = {}
-    try:
-        with open(ftd_file_path, 'r') as file:
-            for line in file:
-                # Skip header lines or invalid data
-                if "Trailer" in line or not line.strip():
-                    continue
-
-                fields = line.split('|')
-                if len(fields) != 6:
-                    print(f"Skipping invalid data in line: {line.strip()}")
-                    continue
-
-                settlement_date = fields[0]
-                symbol = fields[2]
-                quantity = fields[3]
-                price = fields[5]
-
-                # Check if ticker is one we're interested in
-                if symbol in tickers:
-                    try:
-                        quantity = int(quantity)
-                        price = float(price) if price != '.' else 0.0
-                    except ValueError:
-                        print(f"Skipping invalid data (price) in line: {line.strip()}")
-                        continue
-
-                    # Track the highest FTD count for each ticker
-                    if symbol not in ftd_data:
-                        ftd_data[symbol] = {'max_ftd': quantity, 'settlement_date': settlement_date, 'price': price}
-                    else:
-                        if quantity > ftd_data[symbol]['max_ftd']:
-                            ftd_data[symbol] = {'max_ftd': quantity, 'settlement_date': settlement_date, 'price': price}
-
-    except Exception as e:
-        print(f"Error reading FTD file: {e}")
-    
-    return ftd_data
-
-
-
-
-
-
 # Get share dilution
 def get_share_dilution(stock_info):
     shares_outstanding = stock_info.get('sharesOutstanding', 0)
@@ -250,6 +197,7 @@ def print_ticker(ticker, stock_data, squeeze_info):
         market_cap_current = round(stock_data['market_cap'], 2)
         market_cap_month_ago = round(stock_data['market_cap_month_ago'], 2)
         timestamp = stock_data['timestamp']
+        weekly_trend = stock_data.get('weekly_trend', 'NA')
 
         squeeze_label = squeeze_info.get('label', 'No Squeeze Info')
         squeeze_criteria = squeeze_info.get('criteria', {})
@@ -258,7 +206,7 @@ def print_ticker(ticker, stock_data, squeeze_info):
             f"{ticker} | Current Price: {current_price} (as of {timestamp}) | "
             f"Open: {open_price} | Previous Close: {previous_close} | "
             f"Price a Month Ago: {price_month_ago} | Market Cap: {market_cap_current} | "
-            f"Market Cap a Month Ago: {market_cap_month_ago} | "
+            f"Market Cap a Month Ago: {market_cap_month_ago} | Weekly Trend: {weekly_trend} | "
             f"Squeeze Potential: {squeeze_label} | Criteria: {squeeze_criteria}"
         )
     except Exception as e:
@@ -269,75 +217,95 @@ if __name__ == "__main__":
     # Set the tickers you want to analyze
     tickers = ["GME", "AMC", "DJT"]  # Example tickers
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=90)
+    config = load_config()
 
-    print("Fetching stock data...")
-    stock_data = fetch_stock_data(tickers, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+    # Checkpoint fetches and analysis so an interrupted run resumes instead of starting over.
+    # Reporting is cheap and always reprints every analyzed ticker, so analyzed is the final stage.
+    journal = RunJournal(run_key('TradeApp6', tickers, end_date.strftime('%Y-%m-%d')),
+                         config['paths']['checkpoint_dir'], keep_days=config.getint('checkpoints', 'keep_days'),
+                         final_stage='analyzed')
+    to_analyze = set(journal.pending(tickers, 'analyzed'))
 
+    print("Fetching stock data...")
+    stock_data = {}
     for ticker in tickers:
+        if ticker not in to_analyze:
+            continue
+        if journal.done(ticker, 'fetched'):
+            checkpoint = journal.load(ticker, 'fetched')
+            if checkpoint is not None and not checkpoint[0].empty:
+                stock_data[ticker] = checkpoint
+                continue
         try:
             stock_info = yf.Ticker(ticker).info
             df = yf.download(ticker, period="6mo")
+            # Empty downloads (often throttling) aren't checkpointed, so a rerun retries them
             if not df.empty:
+                journal.save(ticker, 'fetched', (df, stock_info))
                 stock_data[ticker] = df, stock_info
         except Exception as e:
             print(f"Error fetching data for {ticker}: {e}")
 
-    # Parsing FTD data
-    print("\nParsing FTD data...")
-    ftd_file_path = r"C:\Users\polid\Documents\tradingscripts\endOctFtd.txt"
-    ftd_data = parse_ftds_file(ftd_file_path, stock_data)
-
     # Now analyze trends and prepare ticker details
     ticker_details = {}
+    for ticker in tickers:
+        if ticker not in to_analyze:
+            details = journal.load(ticker, 'analyzed')
+            if details is not None:
+                ticker_details[ticker] = details
+
+    if stock_data:
+        # FTD data, from the `tradecli.py ftd-ingest` cache when it is current
+        ftd_file_path = config['paths']['ftd_file']
+        ftd_data = load_ftd_cache(config['paths']['cache_dir'], ftd_file_path, stock_data)
+        if ftd_data is None:
+            print("\nParsing FTD data...")
+            ftd_data = parse_ftds_file(ftd_file_path, stock_data)
+        else:
+            print("\nUsing cached FTD data...")
+
+        # Weekly bars and month-ago prices for the whole universe in one pass
+        bars = MultiTimeframeBars({ticker: df for ticker, (df, _) in stock_data.items()})
+
     for ticker, (df, stock_info) in stock_data.items():
         trend = get_trend(df)
-        if trend != "Neutral":
-            squeeze, squeeze_criteria = get_squeeze(ticker, df, stock_info, ftd_data)
-            dilution = get_share_dilution(stock_info)
-
-            ticker_details[ticker] = {
-                'df': df,
-                'stock_info': stock_info,
-                'trend': trend,
-                'current_price': round(df['Close'].iloc[-1], 2),
-                'timestamp': df.index[-1],
-                'open': round(df['Open'].iloc[-1], 2),
-                'previous_close': round(df['Close'].iloc[-2], 2) if len(df) > 1 else round(df['Close'].iloc[-1], 2),
-                'price_month_ago': round(df['Close'].iloc[-30], 2) if len(df) > 30 else round(df['Close'].iloc[0], 2),
-                'market_cap_today': stock_info.get('marketCap', 0),
-                'market_cap_month_ago': stock_info.get('marketCap', 0),  # Placeholder for consistency
-                'squeeze': squeeze,
-                'dilution': dilution
-            }
+        if trend == "Neutral":
+            journal.save(ticker, 'analyzed')
+            continue
+        squeeze, squeeze_criteria = get_squeeze(ticker, df, stock_info, ftd_data)
+        dilution = get_share_dilution(stock_info)
+        price_month_ago = bars.close_days_ago(ticker, 30)
+        if price_month_ago is None:
+            price_month_ago = df['Close'].iloc[0]  # History shorter than a month
+        weekly = bars.frame(ticker, 'weekly')
+
+        ticker_details[ticker] = {
+            'df': df,
+            'stock_info': stock_info,
+            'trend': trend,
+            'current_price': round(df['Close'].iloc[-1], 2),
+            'timestamp': df.index[-1],
+            'open': round(df['Open'].iloc[-1], 2),
+            'previous_close': round(df['Close'].iloc[-2], 2) if len(df) > 1 else round(df['Close'].iloc[-1], 2),
+            'price_month_ago': round(price_month_ago, 2),
+            'weekly_trend': get_trend(weekly) if len(weekly) >= 5 else "Neutral",
+            'market_cap': stock_info.get('marketCap', 0),
+            'market_cap_today': stock_info.get('marketCap', 0),
+            'market_cap_month_ago': stock_info.get('marketCap', 0),  # Placeholder for consistency
+            'squeeze': squeeze,
+            'squeeze_criteria': squeeze_criteria,
+            'dilution': dilution
+        }
+        journal.save(ticker, 'analyzed', {key: value for key, value in ticker_details[ticker].items()
+                                          if key not in ('df', 'stock_info')})
 
     # Group tickers by market cap and trend
     grouped_tickers = group_by_market_cap_and_trend(ticker_details)
 
-    # Use TickerPrinter for detailed output within each group
-    printer = TickerPrinter()
-
-    print("\nAnalyzing for strict bullish trends...\n")
-    print("--- Strict Bullish ---")
-    if "Strict Bullish" in grouped_tickers:
-        for ticker in grouped_tickers["Strict Bullish"]:
-            printer.print_ticker_info(ticker, ticker_details[ticker])
-
-    print("\nAnalyzing for soft bullish trends...\n")
-    print("--- Soft Bullish ---")
-    if "Soft Bullish" in grouped_tickers:
-        for ticker in grouped_tickers["Soft Bullish"]:
-            printer.print_ticker_info(ticker, ticker_details[ticker])
-
-    print("\nAnalyzing for strict bearish trends...\n")
-    print("--- Strict Bearish ---")
-    if "Strict Bearish" in grouped_tickers:
-        for ticker in grouped_tickers["Strict Bearish"]:
-            printer.print_ticker_info(ticker, ticker_details[ticker])
-
-    print("\nAnalyzing for soft bearish trends...\n")
-    print("--- Soft Bearish ---")
-    if "Soft Bearish" in grouped_tickers:
-        for ticker in grouped_tickers["Soft Bearish"]:
-            printer.print_ticker_info(ticker, ticker_details[ticker])
-
+    for trend in ("Strict Bullish", "Soft Bullish", "Strict Bearish", "Soft Bearish"):
+        print(f"\nAnalyzing for {trend.lower()} trends...\n")
+        print(f"--- {trend} ---")
+        for market_cap, tickers_list in grouped_tickers[trend].items():
+            for ticker in tickers_list:
+                details = ticker_details[ticker]
+                print_ticker(ticker, details, {'label': details['squeeze'], 'criteria': details.get('squeeze_criteria', {})})
@@ -0,0 +1,50 @@
+"""
+Settings shared by the scripts and tradecli.py.
+
+Values come from an INI file (tradeapp.ini next to this file, or the path in
+the TRADEAPP_CONFIG environment variable) on top of the defaults below.
+See tradeapp.example.ini. Standard library only, so it is cheap to import.
+"""
+
+import configparser
+import os
+
+CONFIG_ENV = "TRADEAPP_CONFIG"
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tradeapp.ini")
+
+DEFAULTS = {
+    'paths': {
+        'record_log': os.path.join("Data Logs", "AutoLog1.txt"),
+        'error_log': "error_log.txt",
+        'ftd_file': "endOctFtd.txt",
+        'checkpoint_dir': "checkpoints",
+        'cache_dir': "cache",
+    },
+    'checkpoints': {
+        'keep_days': "7",  # Runs untouched for longer are deleted when a new run starts
+    },
+    'screen': {
+        'tickers': "",  # Empty: the ticker list in tradeapp3.0.py
+        'days': "90",
+    },
+    'record': {
+        'interval': "30",
+        'duration': "300",
+        'requests_per_minute': "60",
+    },
+}
+
+
+def load_config(path=None):
+    """ConfigParser with the defaults, overridden by the config file if there is one."""
+    config = configparser.ConfigParser()
+    config.read_dict(DEFAULTS)
+    path = path or os.environ.get(CONFIG_ENV) or DEFAULT_CONFIG_PATH
+    if os.path.exists(path):
+        config.read(path)
+    return config
+
+
+def ticker_list(value):
+    """'gme, amc DJT' -> ['GME', 'AMC', 'DJT']"""
+    return [ticker.strip().upper() for ticker in value.replace(',', ' ').split() if ticker.strip()]
@@ -0,0 +1,96 @@
+"""
+SEC fails-to-deliver (FTD) file parsing.
+
+Standard library only, so the CLI's ftd-ingest can run without pandas.
+`tradecli.py ftd-ingest` parses the file once into the cache and TradeApp6.py
+reads the cache instead of the raw file while it is still current.
+"""
+
+import json
+import os
+from datetime import datetime
+
+FTD_CACHE_FILE = "ftd_latest.json"
+
+
+# Parse FTD data from file
+def parse_ftds_file(ftd_file_path, tickers=None):
+    """Highest fail-to-deliver count per symbol. tickers=None keeps every symbol in the file."""
+    ftd_data = {}
+    try:
+        with open(ftd_file_path, 'r') as file:
+            for line in file:
+                # Skip header lines or invalid data
+                if "Trailer" in line or not line.strip():
+                    continue
+
+                fields = line.split('|')
+                if len(fields) != 6:
+                    print(f"Skipping invalid data in line: {line.strip()}")
+                    continue
+
+                settlement_date = fields[0]
+                symbol = fields[2]
+                quantity = fields[3]
+                price = fields[5]
+
+                # Check if ticker is one we're interested in
+                if tickers is None or symbol in tickers:
+                    try:
+                        quantity = int(quantity)
+                        price = float(price) if price != '.' else 0.0
+                    except ValueError:
+                        print(f"Skipping invalid data (price) in line: {line.strip()}")
+                        continue
+
+                    # Track the highest FTD count for each ticker
+                    if symbol not in ftd_data:
+                        ftd_data[symbol] = {'max_ftd': quantity, 'settlement_date': settlement_date, 'price': price}
+                    else:
+                        if quantity > ftd_data[symbol]['max_ftd']:
+                            ftd_data[symbol] = {'max_ftd': quantity, 'settlement_date': settlement_date, 'price': price}
+
+    except Exception as e:
+        print(f"Error reading FTD file: {e}")
+    
+    return ftd_data
+
+
+def save_ftd_cache(ftd_data, cache_dir, ftd_file_path, tickers=None):
+    """Write parsed FTDs to the cache directory and return the file path."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, FTD_CACHE_FILE)
+    payload = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'source': os.path.abspath(ftd_file_path),
+        'tickers': sorted(tickers) if tickers is not None else None,
+        'ftd': ftd_data,
+    }
+    with open(path + '.tmp', 'w') as file:
+        json.dump(payload, file)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def load_ftd_cache(cache_dir, ftd_file_path, tickers=None):
+    """
+    Cached FTDs for `ftd_file_path`, or None if there is no cache, it came from
+    another file, the file changed since, or it was filtered to other tickers.
+    """
+    path = os.path.join(cache_dir, FTD_CACHE_FILE)
+    if not os.path.exists(path):
+        return None
+    source = os.path.abspath(ftd_file_path)
+    if os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(path):
+        return None
+    try:
+        with open(path, 'r') as file:
+            payload = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"Error reading FTD cache: {e}")
+        return None
+    if payload.get('source') != source:
+        return None
+    if payload.get('tickers') is not None and (tickers is None or not set(tickers) <= set(payload['tickers'])):
+        return None
+    return payload['ftd']
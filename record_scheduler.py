@@ -0,0 +1,249 @@
+"""
+Market-hours-aware polling scheduler for the recorder.
+
+Decides how long each ticker should wait before the next download:
+- Equities only poll while the NYSE session is open, crypto (BTC-USD etc.) polls around the clock
+- Tickers whose data did not change back off, tickers with an ATR or volume spike poll faster
+- All tickers share one global request budget (requests per minute)
+"""
+
+import datetime
+import threading
+import time
+
+import pandas as pd
+
+from resample_engine import ohlcv_column
+
+# ===========================================
+# EXCHANGE CALENDAR
+# ===========================================
+
+SESSION_OPEN = datetime.time(9, 30)
+SESSION_CLOSE = datetime.time(16, 0)
+CLOSING_FETCH = datetime.time(16, 5)  # Last fetch of the day, once the final close and volume are in
+CRYPTO_SUFFIXES = ("-USD", "-USDT", "-USDC", "-EUR", "-GBP", "-BTC", "-ETH")
+
+_holiday_cache = {}
+
+
+def is_continuous(ticker):
+    """Crypto pairs trade 24/7 and never wait for a session."""
+    return ticker.upper().endswith(CRYPTO_SUFFIXES)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """n-th given weekday of a month (n=-1 for the last one)."""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _observed(day):
+    """Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year):
+    """Full-day NYSE closures for a year."""
+    if year not in _holiday_cache:
+        days = {
+            _nth_weekday(year, 1, 0, 3),                       # Martin Luther King Jr. Day
+            _nth_weekday(year, 2, 0, 3),                       # Presidents' Day
+            _easter(year) - datetime.timedelta(days=2),        # Good Friday
+            _nth_weekday(year, 5, 0, -1),                      # Memorial Day
+            _observed(datetime.date(year, 7, 4)),              # Independence Day
+            _nth_weekday(year, 9, 0, 1),                       # Labor Day
+            _nth_weekday(year, 11, 3, 4),                      # Thanksgiving
+            _observed(datetime.date(year, 12, 25)),            # Christmas
+        }
+        # New Year's Day on a Saturday is not observed on the Friday before
+        new_year = datetime.date(year, 1, 1)
+        if new_year.weekday() != 5:
+            days.add(_observed(new_year))
+        if year >= 2022:
+            days.add(_observed(datetime.date(year, 6, 19)))    # Juneteenth
+        _holiday_cache[year] = days
+    return _holiday_cache[year]
+
+
+def is_trading_day(day):
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+
+def eastern_now(now=None):
+    """Current New York wall-clock time as a naive datetime (US DST rules, no tz database needed)."""
+    utc = now or datetime.datetime.now(datetime.timezone.utc)
+    if utc.tzinfo is None:
+        utc = utc.replace(tzinfo=datetime.timezone.utc)
+    utc = utc.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    year = utc.year
+    # DST runs from 2:00 local on the 2nd Sunday of March to 2:00 local on the 1st Sunday of November
+    dst_start = datetime.datetime.combine(_nth_weekday(year, 3, 6, 2), datetime.time(7, 0))
+    dst_end = datetime.datetime.combine(_nth_weekday(year, 11, 6, 1), datetime.time(6, 0))
+    offset = -4 if dst_start <= utc < dst_end else -5
+    return utc + datetime.timedelta(hours=offset)
+
+
+def is_market_open(ticker, now=None):
+    if is_continuous(ticker):
+        return True
+    local = eastern_now(now)
+    return is_trading_day(local.date()) and SESSION_OPEN <= local.time() < SESSION_CLOSE
+
+
+def seconds_until_open(ticker, now=None):
+    """Seconds until the ticker's next session opens (0 if it is open now)."""
+    if is_market_open(ticker, now):
+        return 0.0
+    local = eastern_now(now)
+    day = local.date()
+    while True:
+        session_open = datetime.datetime.combine(day, SESSION_OPEN)
+        if is_trading_day(day) and session_open > local:
+            return (session_open - local).total_seconds()
+        day += datetime.timedelta(days=1)
+
+
+def seconds_until_closing_fetch(ticker, now=None):
+    """
+    Seconds until today's post-close fetch at CLOSING_FETCH, or None if there is
+    none left today (crypto, non-trading days, before the open or after it ran).
+    """
+    if is_continuous(ticker):
+        return None
+    local = eastern_now(now)
+    if not is_trading_day(local.date()) or not SESSION_OPEN <= local.time() < CLOSING_FETCH:
+        return None
+    return (datetime.datetime.combine(local.date(), CLOSING_FETCH) - local).total_seconds()
+
+
+# ===========================================
+# ADAPTIVE SCHEDULER
+# ===========================================
+
+def spike_ratio(data, atr_window=14, lookback=50, volume_window=20):
+    """
+    How far the latest ATR / volume is above its recent average.
+    Returns the larger of the two ratios (1.0 means nothing unusual).
+    """
+    try:
+        if len(data) < atr_window + 1:
+            return 1.0
+        high, low, close = ohlcv_column(data, 'High'), ohlcv_column(data, 'Low'), ohlcv_column(data, 'Close')
+        prev_close = close.shift()
+        true_range = pd.concat([high - low,
+                                abs(high - prev_close),
+                                abs(low - prev_close)], axis=1).max(axis=1)
+        atr = true_range.ewm(alpha=1 / atr_window, adjust=False).mean()
+        atr_avg = atr.iloc[-lookback:].mean()
+        atr_ratio = atr.iloc[-1] / atr_avg if atr_avg > 0 else 1.0
+
+        volume = ohlcv_column(data, 'Volume')
+        volume_avg = volume.iloc[-volume_window - 1:-1].mean()
+        volume_ratio = volume.iloc[-1] / volume_avg if volume_avg > 0 else 1.0
+        ratio = max(float(atr_ratio), float(volume_ratio))
+        return ratio if ratio == ratio else 1.0  # NaN -> 1.0
+    except Exception as e:
+        print(f"DEBUG: Could not compute spike ratio: {e}")
+        return 1.0
+
+
+def data_signature(data):
+    """Cheap fingerprint of the newest bar, used to detect unchanged downloads."""
+    if data is None or len(data) == 0:
+        return None
+    return (str(data.index[-1]), tuple(data.iloc[-1].tolist()))
+
+
+class PollScheduler:
+    """
+    Shared by all recorder threads. Call wait_for_slot() before each download,
+    observe() with the result, then sleep for next_delay().
+    """
+
+    def __init__(self, base_interval, min_interval=5, max_interval=900, backoff=2.0,
+                 requests_per_minute=60, spike_threshold=1.5):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = backoff
+        self.spike_threshold = spike_threshold
+        self.request_spacing = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._state = {}
+
+    def wait_for_slot(self, deadline=None):
+        """
+        Block until the global request budget allows another download.
+        Returns False (without waiting) if the slot would come after `deadline` (time.time()).
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            wait = slot - now
+            if deadline is not None and time.time() + wait > deadline:
+                return False
+            self._next_slot = slot + self.request_spacing
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def observe(self, ticker, data):
+        """Update the ticker's polling interval from a fresh download."""
+        signature = data_signature(data)
+        with self._lock:
+            state = self._state.setdefault(ticker, {'interval': self.base_interval, 'signature': None})
+            unchanged = signature is None or signature == state['signature']
+            state['signature'] = signature
+            previous = state['interval']
+
+        if unchanged:
+            # Nothing new since the last download, back off
+            interval = min(previous * self.backoff, self.max_interval)
+        else:
+            interval = self.base_interval
+            ratio = spike_ratio(data)
+            if ratio >= self.spike_threshold:
+                interval = max(self.min_interval, self.base_interval / ratio)
+                print(f"DEBUG: {ticker} spike ratio {ratio:.2f}, polling every {interval:.0f}s.")
+
+        with self._lock:
+            state['interval'] = interval
+        return interval
+
+    def next_delay(self, ticker, now=None):
+        """Seconds to sleep before the ticker's next download."""
+        with self._lock:
+            interval = self._state.get(ticker, {}).get('interval', self.base_interval)
+        closing = seconds_until_closing_fetch(ticker, now)
+        if closing is not None:
+            # Never sleep past the post-close fetch, so the day's final close and volume get logged
+            return min(interval, closing)
+        closed_for = seconds_until_open(ticker, now)
+        if closed_for > 0:
+            # Daily bars can't change until the next session opens
+            return max(interval, closed_for)
+        return interval
@@ -0,0 +1,137 @@
+"""
+Multi-timeframe resampling over cached daily bars.
+
+Builds one wide (date x ticker) frame per OHLCV field for the whole universe,
+so weekly / monthly / custom bars are a single resample per field instead of
+one per ticker. Calendar-day and bar offsets are precomputed, which makes
+"close N days / N weeks ago" an indexed lookup instead of a boolean mask.
+
+    bars = MultiTimeframeBars(stock_data)          # {ticker: daily OHLCV df}
+    bars.close_days_ago('AAPL', 30)                # price a month ago
+    bars.close_periods_ago('AAPL', 'weekly', 4)    # close 4 weeks ago
+    weekly = bars.frames('weekly')                 # {ticker: weekly OHLCV df}
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+OHLCV_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def _month_end_rule():
+    # pandas 2.2 renamed month-end 'M' to 'ME'
+    try:
+        to_offset('ME')
+        return 'ME'
+    except ValueError:
+        return 'M'
+
+
+TIMEFRAMES = {'daily': None, 'weekly': 'W-FRI', 'monthly': _month_end_rule()}
+
+
+def ohlcv_column(df, field):
+    """Single column as a Series, also for yfinance's (field, ticker) multi-level columns."""
+    column = df[field]
+    if isinstance(column, pd.DataFrame):
+        column = column.iloc[:, 0]
+    return column
+
+
+def _daily_index(index):
+    """Naive, midnight-normalized dates so tz-aware and naive downloads line up."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+class MultiTimeframeBars:
+    def __init__(self, stock_data):
+        fields = {field: {} for field in FIELDS}
+        for ticker, df in stock_data.items():
+            if df is None or df.empty:
+                continue
+            dates = _daily_index(df.index)
+            for field in FIELDS:
+                if field in df.columns:
+                    series = pd.Series(np.asarray(ohlcv_column(df, field), dtype=float), index=dates)
+                    fields[field][ticker] = series[~series.index.duplicated(keep='last')]
+
+        self.tickers = list(fields['Close'])
+        self.base = {field: pd.DataFrame(series, columns=self.tickers).sort_index()
+                     for field, series in fields.items()}
+        self._resampled = {'daily': self.base}
+        self._positions = {ticker: j for j, ticker in enumerate(self.tickers)}
+        self._bars = {}
+
+        # Calendar-day -> row lookup: row of the last bar on or before each day
+        dates = self.base['Close'].index
+        self._first_day = dates[0] if len(dates) else None
+        if self._first_day is not None:
+            calendar = pd.date_range(self._first_day, dates[-1], freq='D')
+            self._calendar_rows = dates.searchsorted(calendar, side='right') - 1
+            # Forward-filled closes so every (day, ticker) has its last known price
+            self._closes = self.base['Close'].ffill().to_numpy()
+
+    # ===========================================
+    # RESAMPLING
+    # ===========================================
+
+    def resample(self, timeframe):
+        """
+        Wide OHLCV frames for a timeframe ('daily', 'weekly', 'monthly' or any pandas
+        rule like '2W-FRI'), computed once for all tickers and cached.
+        """
+        if timeframe not in self._resampled:
+            rule = TIMEFRAMES.get(timeframe, timeframe)
+            resampled = {field: self.base[field].resample(rule).agg(OHLCV_AGG[field]) for field in FIELDS}
+            # Periods without any bar for a ticker get no volume either
+            resampled['Volume'] = resampled['Volume'].where(resampled['Close'].notna())
+            self._resampled[timeframe] = resampled
+        return self._resampled[timeframe]
+
+    def frame(self, ticker, timeframe='daily'):
+        """OHLCV DataFrame of one ticker in the given timeframe."""
+        wide = self.resample(timeframe)
+        df = pd.DataFrame({field: wide[field][ticker] for field in FIELDS})
+        return df.dropna(subset=['Close'])
+
+    def frames(self, timeframe='daily'):
+        """{ticker: OHLCV df} for the whole universe, ready for the trend analysis functions."""
+        return {ticker: self.frame(ticker, timeframe) for ticker in self.tickers}
+
+    # ===========================================
+    # LOOKUPS
+    # ===========================================
+
+    def close_days_ago(self, ticker, days, as_of=None):
+        """Last close on or before `days` calendar days before `as_of` (default: today)."""
+        if ticker not in self._positions or self._first_day is None:
+            return None
+        as_of = pd.Timestamp(as_of or datetime.now())
+        if as_of.tz is not None:
+            as_of = as_of.tz_localize(None)
+        as_of = as_of.normalize()
+        offset = (as_of - timedelta(days=days) - self._first_day).days
+        if offset < 0:
+            return None
+        row = self._calendar_rows[min(offset, len(self._calendar_rows) - 1)]
+        close = self._closes[row, self._positions[ticker]]
+        return None if np.isnan(close) else float(close)
+
+    def close_periods_ago(self, ticker, timeframe, periods):
+        """Close `periods` bars ago in a timeframe (0 = latest, possibly still forming, bar)."""
+        key = (ticker, timeframe)
+        if key not in self._bars:
+            if ticker not in self._positions:
+                return None
+            self._bars[key] = self.resample(timeframe)['Close'][ticker].dropna().to_numpy()
+        closes = self._bars[key]
+        if periods >= len(closes):
+            return None
+        return float(closes[-1 - periods])
@@ -0,0 +1,163 @@
+"""
+Checkpoint journal for resumable universe runs.
+
+Each ticker moves through the stages fetched -> analyzed -> reported.
+Completed stages are appended to a small JSON-lines journal, so a crashed or
+throttled run picks up where every ticker left off. Fetched DataFrames are
+pickled next to the journal; the small analysis and report results are stored
+in the journal line itself. A ticker's pickles are deleted once it reaches the
+run's final stage, and runs untouched for `keep_days` days are pruned.
+
+Pass fresh=True (or delete the checkpoint folder) to throw away an old run
+and start a new, still checkpointed, one under the same key.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import time
+
+from screen_cache import plain_value
+
+STAGES = ("fetched", "analyzed", "reported")
+PICKLED_STAGES = ("fetched",)  # DataFrames, everything later is small enough for the journal line
+CHECKPOINT_DIR = "checkpoints"
+
+
+def run_key(*parts):
+    """Stable id for a run, e.g. run_key('tradeapp3', tickers, '2024-10-31')."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def prune_checkpoints(checkpoint_dir, keep_days, keep=None):
+    """Delete every run (except `keep`) whose journal hasn't been written to for keep_days days."""
+    if not os.path.isdir(checkpoint_dir):
+        return
+    cutoff = time.time() - keep_days * 86400
+    for name in os.listdir(checkpoint_dir):
+        key, ext = os.path.splitext(name)
+        path = os.path.join(checkpoint_dir, name)
+        if ext != '.jsonl' or key == keep or os.path.getmtime(path) >= cutoff:
+            continue
+        os.remove(path)
+        shutil.rmtree(os.path.join(checkpoint_dir, key), ignore_errors=True)
+
+
+class RunJournal:
+    def __init__(self, key, checkpoint_dir=CHECKPOINT_DIR, fresh=False, keep_days=None, final_stage=STAGES[-1]):
+        self.key = key
+        self.final_stage = final_stage
+        self.journal_path = os.path.join(checkpoint_dir, f"{key}.jsonl")
+        self.data_dir = os.path.join(checkpoint_dir, key)
+        if fresh:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            shutil.rmtree(self.data_dir, ignore_errors=True)
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        if keep_days is not None:
+            prune_checkpoints(checkpoint_dir, keep_days, keep=key)
+        self._stages = {}
+        self._payloads = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb+') as file:
+            content = file.read()
+            if content and not content.endswith(b"\n"):
+                # Half-written last line from a crash: drop it, that stage simply reruns
+                content = content[:content.rfind(b"\n") + 1]
+                file.truncate(len(content))
+        for line in content.decode('utf-8').splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if 'payload' in entry:
+                self._payloads[(entry['ticker'], entry['stage'])] = entry['payload']
+            if self._rank(entry['stage']) > self._rank(self._stages.get(entry['ticker'])):
+                self._stages[entry['ticker']] = entry['stage']
+        print(f"Resuming run {self.key}: {self.summary()}")
+
+    @staticmethod
+    def _rank(stage):
+        return STAGES.index(stage) + 1 if stage else 0
+
+    def _payload_path(self, ticker, stage):
+        safe_ticker = re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+        return os.path.join(self.data_dir, f"{safe_ticker}.{stage}.pkl")
+
+    def _release(self, ticker):
+        """Delete a finished ticker's pickles, and the data folder once it is empty."""
+        for stage in PICKLED_STAGES:
+            path = self._payload_path(ticker, stage)
+            if os.path.exists(path):
+                os.remove(path)
+        try:
+            os.rmdir(self.data_dir)
+        except OSError:
+            pass  # Missing, or other tickers still have pickles
+
+    def stage(self, ticker):
+        """Last completed stage for a ticker (None if nothing is checkpointed)."""
+        return self._stages.get(ticker)
+
+    def done(self, ticker, stage):
+        return self._rank(self.stage(ticker)) >= self._rank(stage)
+
+    def pending(self, tickers, stage):
+        return [ticker for ticker in tickers if not self.done(ticker, stage)]
+
+    def save(self, ticker, stage, payload=None):
+        """
+        Checkpoint a completed stage. Fetched payloads are pickled before the journal
+        entry is written, later ones go into the entry as JSON (numpy scalars become
+        plain numbers, timestamps strings).
+        """
+        entry = {'ticker': ticker, 'stage': stage, 'time': round(time.time(), 3)}
+        if payload is not None:
+            if stage in PICKLED_STAGES:
+                os.makedirs(self.data_dir, exist_ok=True)
+                path = self._payload_path(ticker, stage)
+                with open(path + '.tmp', 'wb') as file:
+                    pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(path + '.tmp', path)
+            else:
+                entry['payload'] = payload
+        line = json.dumps(entry, default=plain_value)
+        with open(self.journal_path, 'a') as file:
+            file.write(line + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        if 'payload' in entry:
+            # Keep what a resumed run would read back
+            self._payloads[(ticker, stage)] = json.loads(line)['payload']
+        if self._rank(stage) > self._rank(self._stages.get(ticker)):
+            self._stages[ticker] = stage
+        if self._rank(stage) >= self._rank(self.final_stage):
+            self._release(ticker)
+
+    def load(self, ticker, stage):
+        """Checkpointed payload of a stage, or None if it was saved without one."""
+        if (ticker, stage) in self._payloads:
+            return self._payloads[(ticker, stage)]
+        path = self._payload_path(ticker, stage)
+        if stage not in PICKLED_STAGES or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as file:
+                return pickle.load(file)
+        except Exception as e:
+            print(f"Error loading checkpoint for {ticker} ({stage}): {e}")
+            return None
+
+    def summary(self):
+        counts = {stage: 0 for stage in STAGES}
+        for stage in self._stages.values():
+            counts[stage] += 1
+        return ", ".join(f"{count} {stage}" for stage, count in counts.items())
@@ -0,0 +1,62 @@
+"""
+On-disk cache of the latest screen results.
+
+Standard library only: `tradecli.py screen --cached` prints a finished screen
+without importing pandas, numpy or yfinance.
+"""
+
+import json
+import os
+from datetime import datetime
+
+SCREEN_CACHE_FILE = "screen_latest.json"
+
+
+def plain_value(value):
+    """numpy / pandas scalars -> JSON-friendly Python values."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def save_screen(results, cache_dir, tickers, start_date, end_date):
+    """Write a run_screen() result to the cache directory and return the file path."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, SCREEN_CACHE_FILE)
+    payload = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'start_date': start_date,
+        'end_date': end_date,
+        'tickers': list(tickers),
+        'results': {trend: [[ticker, {key: plain_value(value) for key, value in details.items()}]
+                            for ticker, details in rows]
+                    for trend, rows in results.items()},
+    }
+    with open(path + '.tmp', 'w') as file:
+        json.dump(payload, file)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def load_screen(cache_dir):
+    """Cached screen payload, or None if no screen has been cached yet."""
+    path = os.path.join(cache_dir, SCREEN_CACHE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def print_screen(results):
+    """Print the strict and soft bullish sections of a run_screen result."""
+    for trend, title in (('strict', 'Strict Bullish Trends'), ('soft', 'Soft Bullish Trends')):
+        print(f"\n--- {title} ---")
+        if results[trend]:
+            for ticker, details in results[trend]:
+                print(f"{ticker} | Current Price: {details['current_price']} (as of {details['timestamp']}) | "
+                      f"Open: {details['open_price']} | Previous Close: {details['previous_close']} | "
+                      f"Price a Month Ago: {details['one_month_price']}")
+        else:
+            print("No tickers found.")
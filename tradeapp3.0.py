@@ -2,18 +2,31 @@ import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
 
+from app_config import load_config, ticker_list
+from resample_engine import MultiTimeframeBars
+from run_journal import RunJournal, run_key
+from screen_cache import print_screen
+
 # ===========================================
 # HELPER FUNCTIONS
 # ===========================================
 
-def fetch_stock_data(tickers, start_date, end_date):
-    """Fetch historical stock data for a list of tickers."""
+def fetch_stock_data(tickers, start_date, end_date, journal=None):
+    """Fetch historical stock data for a list of tickers, reusing checkpointed downloads."""
     data = {}
     for ticker in tickers:
+        if journal is not None and journal.done(ticker, 'fetched'):
+            df = journal.load(ticker, 'fetched')
+            if df is not None and not df.empty:
+                data[ticker] = df
+                continue
         try:
             stock = yf.Ticker(ticker)
             df = stock.history(start=start_date, end=end_date)
             if not df.empty:
+                # Empty downloads (often throttling) aren't checkpointed, so a rerun retries them
+                if journal is not None:
+                    journal.save(ticker, 'fetched', df)
                 data[ticker] = df
             else:
                 print(f"No data found for {ticker}")
@@ -21,15 +34,12 @@ def fetch_stock_data(tickers, start_date, end_date):
             print(f"Failed to fetch data for {ticker}: {e}")
     return data
 
-def get_ticker_details(ticker, df):
-    """Retrieve specific price details for a ticker."""
+def get_ticker_details(ticker, df, bars=None):
+    """
+    Retrieve specific price details for a ticker.
+    Pass the universe's MultiTimeframeBars as `bars` to look up the month-ago price by index.
+    """
     try:
-        # Ensure consistent time zones
-        if hasattr(df.index, 'tz'):
-            one_month_ago_date = (datetime.now() - timedelta(days=30)).astimezone(df.index.tz)
-        else:
-            one_month_ago_date = datetime.now() - timedelta(days=30)
-        
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         current_price = df['Close'].iloc[-1]  # Last available closing price
         open_price = df['Open'].iloc[-1]  # Opening price of the last available day
@@ -37,9 +47,17 @@ def get_ticker_details(ticker, df):
 
         # Locate the row closest to one_month_ago_date
         one_month_price = None
-        closest_row = df[df.index <= one_month_ago_date].iloc[-1] if not df[df.index <= one_month_ago_date].empty else None
-        if closest_row is not None:
-            one_month_price = closest_row['Close']
+        if bars is not None:
+            one_month_price = bars.close_days_ago(ticker, 30)
+        else:
+            # Ensure consistent time zones
+            if hasattr(df.index, 'tz'):
+                one_month_ago_date = (datetime.now() - timedelta(days=30)).astimezone(df.index.tz)
+            else:
+                one_month_ago_date = datetime.now() - timedelta(days=30)
+            closest_row = df[df.index <= one_month_ago_date].iloc[-1] if not df[df.index <= one_month_ago_date].empty else None
+            if closest_row is not None:
+                one_month_price = closest_row['Close']
 
         return {
             "timestamp": current_time,
@@ -90,13 +108,73 @@ def analyze_soft_trend(data, window=3):
                 soft_tickers.append((ticker, df))
     return soft_tickers
 
+# ===========================================
+# SCREENING PIPELINE
+# ===========================================
+
+def run_screen(tickers, start_date, end_date, journal=None):
+    """
+    Fetch, analyze and report every ticker, checkpointing each stage in `journal`.
+    An interrupted run resumes from the last completed stage of each ticker.
+    Returns {'strict': [(ticker, details), ...], 'soft': [...]} in ticker order.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    reports = {}
+    if journal is not None:
+        for ticker in tickers:
+            if journal.done(ticker, 'reported'):
+                report = journal.load(ticker, 'reported')
+                if report is not None:
+                    reports[ticker] = report
+    pending = [ticker for ticker in tickers if ticker not in reports]
+
+    # ----- FETCH STOCK DATA -----
+    print(f"Fetching stock data for {len(pending)} of {len(tickers)} tickers...")
+    stock_data = fetch_stock_data(pending, start_date, end_date, journal)
+
+    # ----- TREND ANALYSIS -----
+    print("\nAnalyzing for strict and soft bullish trends...")
+    trends = {}
+    to_analyze = {}
+    for ticker, df in stock_data.items():
+        trend = journal.load(ticker, 'analyzed') if journal is not None and journal.done(ticker, 'analyzed') else None
+        if trend is not None:
+            trends[ticker] = trend
+        else:
+            to_analyze[ticker] = df
+    strict_bullish = {ticker for ticker, _ in analyze_bullish_trend(to_analyze, window=5)}
+    soft_bullish = {ticker for ticker, _ in analyze_soft_trend(to_analyze, window=3)}
+    for ticker in to_analyze:
+        trends[ticker] = {'strict': ticker in strict_bullish, 'soft': ticker in soft_bullish}
+        if journal is not None:
+            journal.save(ticker, 'analyzed', trends[ticker])
+
+    # ----- REPORT DETAILS -----
+    bars = MultiTimeframeBars(stock_data) if stock_data else None
+    for ticker, df in stock_data.items():
+        report = dict(trends[ticker], details=None)
+        if report['strict'] or report['soft']:
+            report['details'] = get_ticker_details(ticker, df, bars)
+        reports[ticker] = report
+        if journal is not None:
+            journal.save(ticker, 'reported', report)
+
+    results = {'strict': [], 'soft': []}
+    for ticker in tickers:
+        report = reports.get(ticker)
+        if report is None or report['details'] is None:
+            continue
+        for trend in results:
+            if report[trend]:
+                results[trend].append((ticker, report['details']))
+    return results
+
 # ===========================================
 # MAIN EXECUTION
 # ===========================================
 
-if __name__ == "__main__":
-    # ----- INPUT PARAMETERS -----
-    tickers = ["AAPL", "GOOG", "MSFT", "AMZN", "FB""HOLX", "HD", "HON", "HRL", "HST", "HUM", "HBAN", "HII", "IBM", "IEX", 
+# ----- INPUT PARAMETERS -----
+DEFAULT_TICKERS = ["AAPL", "GOOG", "MSFT", "AMZN", "FB""HOLX", "HD", "HON", "HRL", "HST", "HUM", "HBAN", "HII", "IBM", "IEX", 
 "IDXX", "ITW", "ILMN", "INCY", "IR", "INTC", "ICE", "IP", "IPG", "IFF", 
 "INTU", "ISRG", "IVZ", "IPGP", "IQV", "IRM", "JBHT", "JKHY", "J", "JNJ", 
 "JCI", "JPM", "JNPR", "K", "KEY", "KMB", "KIM", "KMI", "KLAC", "KHC", 
@@ -121,37 +199,17 @@ if __name__ == "__main__":
 "FRC", "FE", "FISV", "FLT", "FMC", "F", "FTNT", "FTV", "FBHS", "FOX", 
 "FOXA", "BEN", "FCX", "GRMN", "IT", "GE", "GNRC", "GD", "GIS", "GPC", 
 "GILD", "GL", "GS", "GWW", "HAL", "HBI", "HIG", "HAS", "HCA", "HSY","MSTR","AU","PANW","GME","AMC","DJT"]  # Add more tickers here
+
+if __name__ == "__main__":
+    config = load_config()
+    tickers = ticker_list(config['screen']['tickers']) or DEFAULT_TICKERS
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=90)  # Analyze last 90 days of data
+    start_date = end_date - timedelta(days=config.getint('screen', 'days'))  # Analyze last 90 days of data
+    start, end = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
 
-    # ----- FETCH STOCK DATA -----
-    print("Fetching stock data...")
-    stock_data = fetch_stock_data(tickers, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
-
-    # ----- STRICT BULLISH ANALYSIS -----
-    print("\nAnalyzing for strict bullish trends...")
-    strict_bullish_tickers = analyze_bullish_trend(stock_data, window=5)
-    print("\n--- Strict Bullish Trends ---")
-    if strict_bullish_tickers:
-        for ticker, df in strict_bullish_tickers:
-            details = get_ticker_details(ticker, df)
-            if details:
-                print(f"{ticker} | Current Price: {details['current_price']} (as of {details['timestamp']}) | "
-                      f"Open: {details['open_price']} | Previous Close: {details['previous_close']} | "
-                      f"Price a Month Ago: {details['one_month_price']}")
-    else:
-        print("No tickers found.")
-
-    # ----- SOFT BULLISH ANALYSIS -----
-    print("\nAnalyzing for soft bullish trends...")
-    soft_bullish_tickers = analyze_soft_trend(stock_data, window=3)
-    print("\n--- Soft Bullish Trends ---")
-    if soft_bullish_tickers:
-        for ticker, df in soft_bullish_tickers:
-            details = get_ticker_details(ticker, df)
-            if details:
-                print(f"{ticker} | Current Price: {details['current_price']} (as of {details['timestamp']}) | "
-                      f"Open: {details['open_price']} | Previous Close: {details['previous_close']} | "
-                      f"Price a Month Ago: {details['one_month_price']}")
-    else:
-        print("No tickers found.")
+    # ----- CHECKPOINTED RUN -----
+    # Rerunning on the same day resumes from the checkpoints instead of starting over
+    journal = RunJournal(run_key('tradeapp3.0', tickers, start, end), config['paths']['checkpoint_dir'],
+                         keep_days=config.getint('checkpoints', 'keep_days'))
+    results = run_screen(tickers, start, end, journal)
+    print_screen(results)
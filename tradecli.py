@@ -0,0 +1,183 @@
+"""
+One entry point for the screener, the recorder and the FTD tools.
+
+    python tradecli.py screen [--tickers GME AMC] [--days 90] [--fresh]
+    python tradecli.py screen --cached
+    python tradecli.py record --tickers AAPL BTC-USD [--interval 30] [--duration 300]
+    python tradecli.py ftd-ingest [--file cnsfails202410b] [--tickers GME AMC]
+    python tradecli.py bench
+
+pandas, numpy and yfinance are only imported inside the subcommands that need
+them, so --help and `screen --cached` start in well under 100 ms.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app_config import load_config, ticker_list
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('pandas', 'numpy', 'yfinance')
+
+
+def _load_script(filename, module_name):
+    """Import one of the scripts by file name (tradeapp3.0.py isn't a valid module name)."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ===========================================
+# SUBCOMMANDS
+# ===========================================
+
+def cmd_screen(args, config):
+    from screen_cache import load_screen, print_screen, save_screen
+
+    cache_dir = config['paths']['cache_dir']
+    if args.cached:
+        cached = load_screen(cache_dir)
+        if cached is None:
+            print("No cached screen yet, run `python tradecli.py screen` first.")
+            return 1
+        print(f"Cached screen from {cached['created']} "
+              f"({len(cached['tickers'])} tickers, {cached['start_date']} to {cached['end_date']})")
+        print_screen(cached['results'])
+        return 0
+
+    tradeapp = _load_script('tradeapp3.0.py', 'tradeapp3')
+    from run_journal import RunJournal, run_key
+
+    tickers = ticker_list(' '.join(args.tickers or [])) or ticker_list(config['screen']['tickers']) \
+        or tradeapp.DEFAULT_TICKERS
+    days = args.days or config.getint('screen', 'days')
+    end_date = datetime.now()
+    start, end = (end_date - timedelta(days=days)).strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+    # Same run key as tradeapp3.0.py, so the script and the CLI resume each other's runs
+    # --fresh drops the old checkpoints but still checkpoints the new run
+    journal = RunJournal(run_key('tradeapp3.0', tickers, start, end), config['paths']['checkpoint_dir'],
+                         fresh=args.fresh, keep_days=config.getint('checkpoints', 'keep_days'))
+    results = tradeapp.run_screen(tickers, start, end, journal)
+    path = save_screen(results, cache_dir, tickers, start, end)
+    print_screen(results)
+    print(f"\nCached results in {path}")
+    return 0
+
+
+def cmd_record(args, config):
+    import GrokAutoRecord
+
+    GrokAutoRecord.record_assets(
+        ticker_list(' '.join(args.tickers)),
+        args.interval or config.getint('record', 'interval'),
+        args.duration or config.getint('record', 'duration'),
+        args.budget or config.getint('record', 'requests_per_minute'),
+        config,
+    )
+    return 0
+
+
+def cmd_ftd_ingest(args, config):
+    from ftd_data import parse_ftds_file, save_ftd_cache
+
+    ftd_file = args.file or config['paths']['ftd_file']
+    tickers = set(ticker_list(' '.join(args.tickers))) if args.tickers else None
+    ftd_data = parse_ftds_file(ftd_file, tickers)
+    if not ftd_data:
+        print(f"No FTD data found in {ftd_file}.")
+        return 1
+
+    path = save_ftd_cache(ftd_data, config['paths']['cache_dir'], ftd_file, tickers)
+
+    print(f"--- Highest FTDs ({len(ftd_data)} symbols) ---")
+    ranked = sorted(ftd_data.items(), key=lambda item: item[1]['max_ftd'], reverse=True)
+    for symbol, details in ranked[:args.top]:
+        print(f"{symbol} | Max FTD: {details['max_ftd']} | Settlement Date: {details['settlement_date']} | "
+              f"Price: {details['price']}")
+    print(f"\nCached results in {path}")
+    return 0
+
+
+def cmd_bench(args, config):
+    """Time CLI startup in fresh interpreters and check that no heavy module gets imported."""
+    import re
+    import statistics
+    import subprocess
+
+    from screen_cache import SCREEN_CACHE_FILE
+
+    base = [sys.executable, os.path.abspath(__file__)]
+    if args.config:
+        base += ['--config', args.config]
+    if not os.path.exists(os.path.join(config['paths']['cache_dir'], SCREEN_CACHE_FILE)):
+        print("Note: no cached screen yet, `screen --cached` is measured on its cache-miss path.")
+
+    passed = True
+    for label, argv in (('--help', ['--help']), ('screen --cached', ['screen', '--cached'])):
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(base + argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - start) * 1000)
+        import_log = subprocess.run([base[0], '-X', 'importtime'] + base[1:] + argv,
+                                    capture_output=True, text=True).stderr
+        heavy = [module for module in HEAVY_MODULES if re.search(rf"\|\s*{module}\s*$", import_log, re.M)]
+        median = statistics.median(timings)
+        ok = median < args.target_ms and not heavy
+        passed = passed and ok
+        print(f"{label:<16} median {median:6.1f} ms | min {min(timings):6.1f} ms | "
+              f"heavy imports: {', '.join(heavy) or 'none'} | {'PASS' if ok else 'FAIL'}")
+    print(f"Target: < {args.target_ms:.0f} ms without importing {', '.join(HEAVY_MODULES)}")
+    return 0 if passed else 1
+
+
+# ===========================================
+# ARGUMENT PARSING
+# ===========================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='tradecli', description="Stock screener, recorder and FTD tools.")
+    parser.add_argument('--config', help="Path to a tradeapp.ini (default: TRADEAPP_CONFIG, then tradeapp.ini next to the scripts)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    screen = subparsers.add_parser('screen', help="Screen tickers for strict and soft bullish trends")
+    screen.add_argument('--tickers', nargs='+', help="Tickers to screen (default: config, then tradeapp3.0.py list)")
+    screen.add_argument('--days', type=int, help="Days of history to analyze")
+    screen.add_argument('--cached', action='store_true', help="Print the last cached screen without fetching")
+    screen.add_argument('--fresh', action='store_true', help="Discard checkpoints from an earlier run and start over")
+    screen.set_defaults(func=cmd_screen)
+
+    record = subparsers.add_parser('record', help="Record indicators for tickers on an adaptive schedule")
+    record.add_argument('--tickers', nargs='+', required=True, help="Tickers to record, e.g. AAPL BTC-USD")
+    record.add_argument('--interval', type=int, help="Base polling interval in seconds")
+    record.add_argument('--duration', type=int, help="Total runtime in seconds")
+    record.add_argument('--budget', type=int, help="Max downloads per minute across all tickers")
+    record.set_defaults(func=cmd_record)
+
+    ftd = subparsers.add_parser('ftd-ingest', help="Parse an SEC fails-to-deliver file into the cache TradeApp6.py reads")
+    ftd.add_argument('--file', help="FTD file (default: paths.ftd_file from the config)")
+    ftd.add_argument('--tickers', nargs='+', help="Only keep these symbols")
+    ftd.add_argument('--top', type=int, default=20, help="How many of the highest FTDs to print")
+    ftd.set_defaults(func=cmd_ftd_ingest)
+
+    bench = subparsers.add_parser('bench', help="Benchmark CLI startup time")
+    bench.add_argument('--runs', type=int, default=10, help="Runs per measured command")
+    bench.add_argument('--target-ms', type=float, default=100.0, help="Startup time target in milliseconds")
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args, load_config(args.config))
+
+
+if __name__ == "__main__":
+    sys.exit(main())